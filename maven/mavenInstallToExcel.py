@@ -1,25 +1,25 @@
-import pandas as pd
 import re
+from openpyxl import Workbook
+
+# 定义提取模块名的正则表达式
+module_pattern = re.compile(r'\[INFO\] ([^\s]+)')
 
 
 def parse_module_results(file_path, out_path):
-    # 定义提取模块名的正则表达式
-    pattern = r'\[INFO\] ([^\s]+)'
-    # 读取日志文件
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-    # 提取模块名
+    # 逐行读取日志文件并提取模块名
     modules = []
-    for line in lines:
-        match = re.search(pattern, line)
-        if match:
-            module_name = match.group(1)
-            modules.append(module_name)
-    # 创建DataFrame
-    df = pd.DataFrame(modules, columns=["Module"])
-
-    # 保存到Excel文件
-    df.to_excel(out_path, index=False)
+    with open(file_path, "r") as f:
+        for line in f:
+            match = module_pattern.search(line)
+            if match:
+                modules.append(match.group(1))
+    # 以只写模式流式写入Excel文件
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["Module"])
+    for module in modules:
+        ws.append([module])
+    wb.save(out_path)
 
 
 if __name__ == '__main__':
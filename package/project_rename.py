@@ -1,101 +1,145 @@
 import os
 import glob
-import fileinput
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 replace_java_file_folder = ["src/main/java", "src/test/java"]
 replace_java_resource_folder = ["src/main/resources", "src/test/resources"]
 
 
 def replace_package_and_path(root_directory, old_package, new_package):
-    # 遍历根目录下的所有子模块
-    # 构建包名的正则表达式
-    pattern = r'\b' + re.escape(old_package) + r'\b'
+    # 遍历根目录下的所有子模块，每个模块交给进程池并行处理
+    pom_paths = find_module_poms(root_directory)
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(partial(process_module, old_package=old_package, new_package=new_package),
+                          pom_paths))
+
+
+def process_module(pom_path, old_package, new_package):
+    # 预编译本模块用到的正则表达式
+    # 包名
+    package_pattern = re.compile(r'\b' + re.escape(old_package) + r'\b')
     group_id_rules = [
-        (fr"<groupId>{re.escape(old_package)}</groupId>", fr"<groupId>{new_package}</groupId>"),
+        (re.compile(fr"<groupId>{re.escape(old_package)}</groupId>"), fr"<groupId>{new_package}</groupId>"),
         # 添加更多规则...
     ]
-    for item in glob.glob(os.path.join(root_directory, "**/pom.xml"), recursive=True):
-        # 替换 pom.xml 中的 <groupId>
-        with fileinput.FileInput(item, inplace=True) as file:
-            for line in file:
-                new_line = replace_group_id(line, group_id_rules)
-                print(new_line, end='')
-
-        module_directory = os.path.dirname(item)
-        for i in range(len(replace_java_file_folder)):
-            current_java_file_folder = replace_java_file_folder[i]
-            current_java_resource_folder = replace_java_resource_folder[i];
-            java_file_folder_package_directory = os.path.join(module_directory, current_java_file_folder)
-            java_resource_package_directory = os.path.join(module_directory, current_java_resource_folder)
-            if os.path.isdir(java_file_folder_package_directory):
-                # 遍历子模块下的所有 Java 文件
-                for file_path in glob.glob(os.path.join(java_file_folder_package_directory, "**/*.java"),
-                                           recursive=True):
+    # java 文件路径中的包目录
+    class_patterns = {
+        folder: re.compile(fr"(?<={re.escape(folder + '/')})({re.escape(old_package.replace('.', '/'))})(?=/)")
+        for folder in replace_java_file_folder
+    }
+    # spring.factories 中的包名
+    spring_factories_pattern = re.compile(fr"(?<=^)(\s*){re.escape(old_package)}", flags=re.MULTILINE)
+    # 替换 pom.xml 中的 <groupId>
+    rewrite_file(pom_path, lambda content: replace_group_id(content, group_id_rules))
+
+    module_directory = os.path.dirname(pom_path)
+    for i in range(len(replace_java_file_folder)):
+        current_java_file_folder = replace_java_file_folder[i]
+        current_java_resource_folder = replace_java_resource_folder[i];
+        java_file_folder_package_directory = os.path.join(module_directory, current_java_file_folder)
+        java_resource_package_directory = os.path.join(module_directory, current_java_resource_folder)
+        if os.path.isdir(java_file_folder_package_directory):
+            # 遍历子模块下的所有 Java 文件
+            # 先收集文件列表，避免遍历到本轮刚写入的新路径
+            for file_path in list(iter_files(java_file_folder_package_directory, '.java')):
+                # 读取文件内容
+                with open(file_path, 'r', encoding='ISO-8859-1') as file:
+                    file_content = file.read()
+
+                # 替换 package，文件中不包含旧包名时跳过正则替换
+                new_content = file_content
+                if old_package in file_content:
+                    new_content = package_pattern.sub(new_package, file_content)
+
+                # 使用变量替换文件路径
+                new_file_path = class_patterns[current_java_file_folder].sub(new_package.replace('.', '/'), file_path)
+
+                # 内容和路径都没有变化，无需重写
+                if new_content == file_content and new_file_path == file_path:
+                    continue
+
+                # 只有路径变化时，直接移动文件
+                if new_content == file_content:
+                    os.renames(file_path, new_file_path)
+                    continue
+
+                # 确保新文件路径的目录存在
+                os.makedirs(os.path.dirname(new_file_path), exist_ok=True)
+
+                # 将替换后的内容写入新文件路径
+                with open(new_file_path, 'w', encoding='ISO-8859-1') as file:
+                    file.write(new_content)
+
+                # 路径变化时删除原文件
+                if new_file_path != file_path:
+                    os.remove(file_path)
+
+            # 删除原始文件夹 替换后原始文件夹为空文件夹，但是存在，手动删除
+            delete_empty_folders(java_file_folder_package_directory)
+            # 替换 Spring 配置文件中的内容
+            spring_factories_path = os.path.join(module_directory, "src/main/resources/META-INF/spring.factories")
+            if os.path.isfile(spring_factories_path):
+                rewrite_file(spring_factories_path,
+                             lambda content: spring_factories_pattern.sub(r"\1" + new_package, content))
+            # 构建正则表达式模式
+            if os.path.isdir(java_resource_package_directory):
+                # 遍历子模块下的所有资源文件
+                for file_path in iter_files(java_resource_package_directory, ('.properties', '.xml')):
+                    # 输出文件路径
+                    print("处理文件:", file_path)
+
                     # 读取文件内容
                     with open(file_path, 'r', encoding='ISO-8859-1') as file:
                         file_content = file.read()
 
-                    # 替换 package
-                    # new_content = # 替换包名
-                    new_content = re.sub(pattern, new_package, file_content)
+                    # 替换文件内容
+                    new_content = file_content.replace(old_package, new_package)
 
-                    # 构建正则表达式模式
-                    class_pattern = fr"(?<={re.escape(current_java_file_folder + '/')})({re.escape(old_package.replace('.', '/'))})(?=/)"
+                    # 内容没有变化，无需重写
+                    if new_content == file_content:
+                        continue
 
-                    # 使用变量替换文件路径
-                    new_file_path = re.sub(class_pattern, new_package.replace('.', '/'), file_path)
+                    # 将替换后的内容写入文件
+                    with open(file_path, 'w', encoding='ISO-8859-1') as file:
+                        file.write(new_content)
 
-                    # 确保新文件路径的目录存在
-                    os.makedirs(os.path.dirname(new_file_path), exist_ok=True)
 
-                    # 将替换后的内容写入新文件路径
-                    with open(new_file_path, 'w', encoding='ISO-8859-1') as file:
-                        file.write(new_content)
+def rewrite_file(file_path, transform):
+    # 整体读取文件并替换，内容有变化时才写回
+    with open(file_path, 'r', encoding='ISO-8859-1') as file:
+        file_content = file.read()
+    new_content = transform(file_content)
+    if new_content != file_content:
+        with open(file_path, 'w', encoding='ISO-8859-1') as file:
+            file.write(new_content)
 
-                    # 删除原文件
-                    os.remove(file_path)
 
-                # 删除原始文件夹 替换后原始文件夹为空文件夹，但是存在，手动删除
-                delete_empty_folders(java_file_folder_package_directory)
-                # 替换 Spring 配置文件中的内容
-                spring_factories_path = os.path.join(module_directory, "src/main/resources/META-INF/spring.factories")
-                if os.path.isfile(spring_factories_path):
-                    with fileinput.FileInput(spring_factories_path, inplace=True) as file:
-                        for line in file:
-                            new_line = re.sub(fr"(?<=^)(\s*){re.escape(old_package)}", r"\1" + new_package, line)
-                            print(new_line, end='')
-                # 构建正则表达式模式
-                if os.path.isdir(java_resource_package_directory):
-                    # 遍历子模块下的所有资源文件
-                    for file_path in glob.glob(os.path.join(java_resource_package_directory, "**/*"), recursive=True):
-                        # 只处理文件，不处理文件夹
-                        if file_path.endswith(('.properties', '.xml')):
-                            # 输出文件路径
-                            print("处理文件:", file_path)
-
-                            # 读取文件内容
-                            with open(file_path, 'r', encoding='ISO-8859-1') as file:
-                                file_content = file.read()
-
-                            # 替换文件内容
-                            new_content = re.sub(
-                                fr"(?<=^)(.*{re.escape(old_package)}.*)",
-                                lambda match: match.group().replace(old_package, new_package),
-                                file_content,
-                                flags=re.MULTILINE
-                            )
-
-                            # 将替换后的内容写入文件
-                            with open(file_path, 'w', encoding='ISO-8859-1') as file:
-                                file.write(new_content)
-
-
-def replace_group_id(line, rules):
-    updated_line = line
+def replace_group_id(content, rules):
+    updated_content = content
     for pattern, replacement in rules:
-        updated_line = re.sub(pattern, replacement, updated_line)
-    return updated_line
+        updated_content = pattern.sub(replacement, updated_content)
+    return updated_content
+
+
+def find_module_poms(root_directory):
+    # 查找所有模块的 pom.xml，排除位于其他模块 src 目录下的 pom.xml（如 archetype-resources），
+    # 保证交给进程池的各模块之间不会处理同一批文件
+    pom_paths = glob.glob(os.path.join(root_directory, "**/pom.xml"), recursive=True)
+    src_directories = [os.path.join(os.path.dirname(pom_path), "src") + os.sep for pom_path in pom_paths]
+    return [pom_path for pom_path in pom_paths
+            if not any(pom_path.startswith(src_directory) for src_directory in src_directories)]
+
+
+def iter_files(folder_path, extensions):
+    # 逐个返回目录下指定后缀的文件，不预先构建完整列表
+    # 与 glob 的 "**" 保持一致：跳过以 . 开头的目录和文件，并跟随目录软链接
+    for root, dirs, files in os.walk(folder_path, followlinks=True):
+        dirs[:] = [folder for folder in dirs if not folder.startswith('.')]
+        for name in files:
+            if not name.startswith('.') and name.endswith(extensions):
+                yield os.path.join(root, name)
 
 
 def delete_empty_folders(folder_path):